@@ -1,11 +1,16 @@
 """Support for the OSO Energy devices and services."""
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta
+import logging
 from typing import Any, Generic, TypeVar
 
+from aiohttp import ClientError
 from aiohttp.web_exceptions import HTTPException
 from apyosoenergyapi import OSOEnergy
 from apyosoenergyapi.helper.const import (
     OSOEnergyBinarySensorData,
     OSOEnergySensorData,
+    OSOEnergySwitchData,
     OSOEnergyWaterHeaterData,
 )
 from apyosoenergyapi.helper.osoenergy_exceptions import OSOEnergyReauthRequired
@@ -15,24 +20,45 @@ from homeassistant.const import CONF_API_KEY, Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
 from homeassistant.helpers import aiohttp_client
-from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
 from homeassistant.helpers.entity import Entity
+import homeassistant.util.dt as dt_util
+
+from .const import (
+    ATTR_DATA_AGE,
+    CONF_POWER_LIMIT,
+    CONF_PROFILING,
+    CONF_STALE_DATA_TOLERANCE,
+    CONF_TRACE_MODE,
+    DEFAULT_STALE_DATA_TOLERANCE,
+    DOMAIN,
+    TRACE_MODE_OFF,
+)
+from .load_shedding import async_setup_load_shedding
+from .profiler import OSOEnergyProfiler, async_get_profiler, async_setup_profiler
+from .timeline import async_remove_timelines, async_setup_timelines
+from .trace import async_setup_trace
 
-from .const import DOMAIN
-
+_LOGGER = logging.getLogger(__name__)
 _T = TypeVar(
-    "_T", OSOEnergyBinarySensorData, OSOEnergySensorData, OSOEnergyWaterHeaterData
+    "_T",
+    OSOEnergyBinarySensorData,
+    OSOEnergySensorData,
+    OSOEnergySwitchData,
+    OSOEnergyWaterHeaterData,
 )
 
 MANUFACTURER = "OSO Energy"
 PLATFORMS = [
     Platform.BINARY_SENSOR,
+    Platform.CALENDAR,
     Platform.SENSOR,
     Platform.SWITCH,
     Platform.WATER_HEATER,
 ]
 PLATFORM_LOOKUP = {
     Platform.BINARY_SENSOR: "binary_sensor",
+    Platform.CALENDAR: "water_heater",
     Platform.SENSOR: "sensor",
     Platform.SWITCH: "switch",
     Platform.WATER_HEATER: "water_heater",
@@ -49,6 +75,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     hass.data.setdefault(DOMAIN, {})
 
+    if entry.options.get(CONF_TRACE_MODE, TRACE_MODE_OFF) != TRACE_MODE_OFF:
+        await async_setup_trace(hass, entry, osoenergy)
+
     try:
         devices: Any = await osoenergy.session.start_session(osoenergy_config)
     except HTTPException as error:
@@ -57,6 +86,15 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         raise ConfigEntryAuthFailed from err
 
     hass.data[DOMAIN][entry.entry_id] = osoenergy
+    await async_setup_timelines(hass)
+
+    if entry.options.get(CONF_PROFILING, False):
+        async_setup_profiler(hass, entry)
+
+    if entry.options.get(CONF_POWER_LIMIT, 0) > 0:
+        async_setup_load_shedding(hass, entry, osoenergy)
+
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
     platforms = set()
     for ha_type, oso_type in PLATFORM_LOOKUP.items():
@@ -72,20 +110,89 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        osoenergy = hass.data[DOMAIN].pop(entry.entry_id)
+        async_remove_timelines(
+            hass,
+            (
+                device.device_id
+                for device in osoenergy.session.device_list.get("water_heater", [])
+            ),
+        )
 
     return unload_ok
 
 
-class OSOEnergyEntity(Entity, Generic[_T]):
-    """Initiate OSO Energy Base Class."""
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload a config entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
+class OSOEnergyBaseEntity(Entity):
+    """Initiate OSO Energy Shared Base Class."""
 
     _attr_has_entity_name = True
+    osoenergy: OSOEnergy
+    profiler: OSOEnergyProfiler | None = None
+    stale_data_tolerance = timedelta(seconds=DEFAULT_STALE_DATA_TOLERANCE)
+
+    @property
+    def last_poll(self) -> datetime:
+        """Return the time of the last poll of the session."""
+        # The session timestamps its data with naive local time.
+        return self.osoenergy.session.config.last_update.astimezone()
+
+    @property
+    def last_good_update(self) -> datetime | None:
+        """Return the time of the last good data of the entity."""
+        return self.last_poll
+
+    @property
+    def data_age(self) -> timedelta | None:
+        """Return the age of the last good data."""
+        if (last_good_update := self.last_good_update) is None:
+            return None
+        return dt_util.now() - last_good_update
+
+    @property
+    def available(self) -> bool:
+        """Return if the last good data is recent enough."""
+        data_age = self.data_age
+        return data_age is not None and data_age <= self.stale_data_tolerance
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Flag data that is served from the cache."""
+        data_age = self.data_age
+        scan_interval = self.osoenergy.session.config.scan_interval
+        if data_age is None or data_age <= 2 * scan_interval:
+            return None
+        return {ATTR_DATA_AGE: int(data_age.total_seconds())}
+
+    async def async_added_to_hass(self) -> None:
+        """Attach the event loop profiler and read the entry options."""
+        await super().async_added_to_hass()
+        if (entry := self.platform.config_entry) is not None:
+            self.profiler = async_get_profiler(self.hass, entry.entry_id)
+            self.stale_data_tolerance = timedelta(
+                seconds=entry.options.get(
+                    CONF_STALE_DATA_TOLERANCE, DEFAULT_STALE_DATA_TOLERANCE
+                )
+            )
+
+
+class OSOEnergyEntity(OSOEnergyBaseEntity, Generic[_T]):
+    """Initiate OSO Energy Base Class."""
 
     def __init__(self, osoenergy: OSOEnergy, osoenergy_device: _T) -> None:
         """Initialize the instance."""
         self.osoenergy = osoenergy
         self.device = osoenergy_device
+        self._last_good_update: datetime | None = None
+
+    @property
+    def last_good_update(self) -> datetime | None:
+        """Return the time of the last good data of the device."""
+        return self._last_good_update
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -96,3 +203,43 @@ class OSOEnergyEntity(Entity, Generic[_T]):
             model=self.device.device_type,
             name=self.device.device_name,
         )
+
+    async def async_update_device(
+        self, get_device: Callable[[_T], Awaitable[_T]]
+    ) -> bool:
+        """Refresh the device data, keeping the last good data on failure.
+
+        Return True when fresh device data was received.
+        """
+        session = self.osoenergy.session
+        try:
+            await session.update_data()
+            device = await get_device(self.device)
+        except (ClientError, HTTPException, OSError) as err:
+            _LOGGER.debug("Serving cached data for %s: %s", self.entity_id, err)
+            return False
+
+        if not device.online:
+            return False
+
+        self.device = device
+        self._set_last_good_update()
+        return True
+
+    def _set_last_good_update(self) -> None:
+        """Mark the device data of the last poll as good."""
+        self._last_good_update = self.last_poll
+
+
+class OSOEnergyAccountEntity(OSOEnergyBaseEntity):
+    """Initiate OSO Energy Account Base Class."""
+
+    def __init__(self, osoenergy: OSOEnergy, entry: ConfigEntry) -> None:
+        """Initialize the instance."""
+        self.osoenergy = osoenergy
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry.entry_id)},
+            entry_type=DeviceEntryType.SERVICE,
+            manufacturer=MANUFACTURER,
+            name=entry.title,
+        )
@@ -16,6 +16,7 @@ from homeassistant.helpers.typing import StateType
 
 from . import OSOEnergyEntity
 from .const import DOMAIN
+from .profiler import profile_callback, profile_coroutine
 
 
 @dataclass
@@ -82,11 +83,12 @@ class OSOEnergyBinarySensor(
         self.entity_description = description
 
     @property
+    @profile_callback
     def is_on(self) -> bool | None:
         """Return the state of the sensor."""
         return self.entity_description.value(self.device)
 
+    @profile_coroutine
     async def async_update(self):
         """Update all data for OSO Energy."""
-        await self.osoenergy.session.update_data()
-        self.device = await self.osoenergy.binary_sensor.get_sensor(self.device)
+        await self.async_update_device(self.osoenergy.binary_sensor.get_sensor)
@@ -0,0 +1,71 @@
+"""Support for OSO Energy calendars."""
+
+from datetime import datetime
+
+from apyosoenergyapi import OSOEnergy
+from apyosoenergyapi.helper.const import OSOEnergyWaterHeaterData
+
+from homeassistant.components.calendar import CalendarEntity, CalendarEvent
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+import homeassistant.util.dt as dt_util
+
+from . import OSOEnergyEntity
+from .const import DOMAIN
+from .profiler import profile_callback, profile_coroutine
+from .timeline import OSOEnergyTimeline, async_get_timeline
+
+
+async def async_setup_entry(
+    hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
+) -> None:
+    """Set up OSO Energy calendar based on a config entry."""
+    osoenergy = hass.data[DOMAIN][entry.entry_id]
+    devices = osoenergy.session.device_list.get("water_heater")
+    entities = []
+    if devices:
+        for dev in devices:
+            timeline = async_get_timeline(hass, dev.device_id)
+            entities.append(OSOEnergyCalendar(osoenergy, dev, timeline))
+
+    async_add_entities(entities, True)
+
+
+class OSOEnergyCalendar(OSOEnergyEntity[OSOEnergyWaterHeaterData], CalendarEntity):
+    """Holiday periods and temperature profile of an OSO Energy heater."""
+
+    _attr_translation_key = "schedule"
+
+    def __init__(
+        self,
+        instance: OSOEnergy,
+        osoenergy_device: OSOEnergyWaterHeaterData,
+        timeline: OSOEnergyTimeline,
+    ) -> None:
+        """Initialize the calendar."""
+        super().__init__(instance, osoenergy_device)
+        self.timeline = timeline
+        self._attr_unique_id = f"{osoenergy_device.device_id}_schedule"
+
+    @property
+    @profile_callback
+    def event(self) -> CalendarEvent | None:
+        """Return the current or next upcoming event."""
+        return self.timeline.async_get_next_event(dt_util.utcnow())
+
+    @profile_coroutine
+    async def async_get_events(
+        self, hass: HomeAssistant, start_date: datetime, end_date: datetime
+    ) -> list[CalendarEvent]:
+        """Return calendar events within a datetime range."""
+        return self.timeline.async_get_events(start_date, end_date)
+
+    @profile_coroutine
+    async def async_update(self) -> None:
+        """Update the timeline of the heater."""
+        if await self.async_update_device(self.osoenergy.hotwater.get_water_heater):
+            self.timeline.async_update_profile(self.device.profile)
+            self.timeline.async_update_holiday_mode(
+                self.device.isInPowerSave, dt_util.utcnow()
+            )
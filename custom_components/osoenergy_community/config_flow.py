@@ -9,12 +9,30 @@ from apyosoenergyapi import OSOEnergy
 import voluptuous as vol
 
 from homeassistant import config_entries
-from homeassistant.config_entries import ConfigEntry
+from homeassistant.config_entries import ConfigEntry, OptionsFlow
 from homeassistant.const import CONF_API_KEY
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
-from homeassistant.helpers import aiohttp_client
-
-from .const import DOMAIN
+from homeassistant.helpers import aiohttp_client, selector
+
+from .const import (
+    CONF_POWER_LIMIT,
+    CONF_PRICE_ENTITY,
+    CONF_PROFILING,
+    CONF_REPLAY_SPEED,
+    CONF_SLOW_CALLBACK_THRESHOLD,
+    CONF_STALE_DATA_TOLERANCE,
+    CONF_TRACE_FILE,
+    CONF_TRACE_MODE,
+    DEFAULT_POWER_LIMIT,
+    DEFAULT_REPLAY_SPEED,
+    DEFAULT_SLOW_CALLBACK_THRESHOLD,
+    DEFAULT_STALE_DATA_TOLERANCE,
+    DEFAULT_TRACE_FILE,
+    DOMAIN,
+    TRACE_MODE_OFF,
+    TRACE_MODES,
+)
 
 _LOGGER = logging.getLogger(__name__)
 _SCHEMA_STEP_USER = vol.Schema({vol.Required(CONF_API_KEY): str})
@@ -70,8 +88,77 @@ class OSOEnergyFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             _LOGGER.exception("Unknown error occurred")
         return None
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        """Get the options flow for this handler."""
+        return OSOEnergyOptionsFlowHandler(config_entry)
+
     async def async_step_reauth(self, user_input: Mapping[str, Any]) -> FlowResult:
         """Re Authenticate a user."""
         self.entry = self.hass.config_entries.async_get_entry(self.context["entry_id"])
         data = {CONF_API_KEY: user_input[CONF_API_KEY]}
         return await self.async_step_user(data)
+
+
+class OSOEnergyOptionsFlowHandler(OptionsFlow):
+    """Handle OSO Energy options."""
+
+    def __init__(self, entry: ConfigEntry) -> None:
+        """Initialize."""
+        self.entry = entry
+
+    async def async_step_init(self, user_input=None) -> FlowResult:
+        """Manage the OSO Energy options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self.entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_PROFILING,
+                        default=options.get(CONF_PROFILING, False),
+                    ): bool,
+                    vol.Optional(
+                        CONF_SLOW_CALLBACK_THRESHOLD,
+                        default=options.get(
+                            CONF_SLOW_CALLBACK_THRESHOLD,
+                            DEFAULT_SLOW_CALLBACK_THRESHOLD,
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=10000)),
+                    vol.Optional(
+                        CONF_POWER_LIMIT,
+                        default=options.get(CONF_POWER_LIMIT, DEFAULT_POWER_LIMIT),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                    vol.Optional(
+                        CONF_STALE_DATA_TOLERANCE,
+                        default=options.get(
+                            CONF_STALE_DATA_TOLERANCE, DEFAULT_STALE_DATA_TOLERANCE
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=60, max=86400)),
+                    vol.Optional(
+                        CONF_TRACE_MODE,
+                        default=options.get(CONF_TRACE_MODE, TRACE_MODE_OFF),
+                    ): vol.In(TRACE_MODES),
+                    vol.Optional(
+                        CONF_TRACE_FILE,
+                        default=options.get(CONF_TRACE_FILE, DEFAULT_TRACE_FILE),
+                    ): str,
+                    vol.Optional(
+                        CONF_REPLAY_SPEED,
+                        default=options.get(CONF_REPLAY_SPEED, DEFAULT_REPLAY_SPEED),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=10000)),
+                    vol.Optional(
+                        CONF_PRICE_ENTITY,
+                        description={
+                            "suggested_value": options.get(CONF_PRICE_ENTITY)
+                        },
+                    ): selector.EntitySelector(
+                        selector.EntitySelectorConfig(domain="sensor")
+                    ),
+                }
+            ),
+        )
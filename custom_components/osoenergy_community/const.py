@@ -1,3 +1,25 @@
 """Constants for OSO Energy."""
 
 DOMAIN = "osoenergy_community"
+
+CONF_POWER_LIMIT = "power_limit"
+CONF_PRICE_ENTITY = "price_entity"
+CONF_PROFILING = "profiling"
+CONF_REPLAY_SPEED = "replay_speed"
+CONF_SLOW_CALLBACK_THRESHOLD = "slow_callback_threshold"
+CONF_STALE_DATA_TOLERANCE = "stale_data_tolerance"
+CONF_TRACE_FILE = "trace_file"
+CONF_TRACE_MODE = "trace_mode"
+
+DEFAULT_POWER_LIMIT = 0.0
+DEFAULT_REPLAY_SPEED = 1.0
+DEFAULT_SLOW_CALLBACK_THRESHOLD = 50
+DEFAULT_STALE_DATA_TOLERANCE = 300
+DEFAULT_TRACE_FILE = "osoenergy_trace.jsonl.gz"
+
+TRACE_MODE_OFF = "off"
+TRACE_MODE_RECORD = "record"
+TRACE_MODE_REPLAY = "replay"
+TRACE_MODES = [TRACE_MODE_OFF, TRACE_MODE_RECORD, TRACE_MODE_REPLAY]
+
+ATTR_DATA_AGE = "data_age"
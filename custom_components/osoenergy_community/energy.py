@@ -0,0 +1,137 @@
+"""Incremental energy and cost accounting for OSO Energy heaters."""
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT
+from homeassistant.core import HomeAssistant
+from homeassistant.generated.currencies import ACTIVE_CURRENCIES
+from homeassistant.helpers.restore_state import ExtraStoredData
+import homeassistant.util.dt as dt_util
+
+# Intervals without samples for longer than this, e.g. while Home Assistant
+# was stopped, are skipped instead of being interpolated.
+MAX_SAMPLE_GAP = timedelta(hours=1)
+# Factors from a price per unit of energy to a price per kWh.
+PRICE_FACTORS = {"Wh": 1000.0, "kWh": 1.0, "MWh": 0.001}
+
+
+@dataclass
+class OSOEnergyAccumulator(ExtraStoredData):
+    """Trapezoidal integral of a rate over time, in rate units times hours."""
+
+    total: float = 0.0
+    last_time: datetime | None = None
+    last_value: float | None = None
+
+    def add_sample(self, time: datetime, value: float | None) -> float:
+        """Add a sample, returning how much the total increased.
+
+        Samples with the same time as the previous one are ignored, so the
+        same poll can be added more than once. A missing value ends the
+        current interval without adding to the total.
+        """
+        if self.last_time is not None and time <= self.last_time:
+            return 0.0
+
+        increase = 0.0
+        if (
+            self.last_time is not None
+            and self.last_value is not None
+            and value is not None
+            and time - self.last_time <= MAX_SAMPLE_GAP
+        ):
+            hours = (time - self.last_time).total_seconds() / 3600
+            increase = (self.last_value + value) / 2 * hours
+            self.total += increase
+
+        self.last_time = time
+        self.last_value = value
+        return increase
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a dict representation of the accumulator."""
+        return {
+            "total": self.total,
+            "last_time": self.last_time.isoformat() if self.last_time else None,
+            "last_value": self.last_value,
+        }
+
+    @classmethod
+    def from_dict(cls, restored: dict[str, Any]) -> OSOEnergyAccumulator | None:
+        """Initialize an accumulator from a dict."""
+        try:
+            last_time = restored.get("last_time")
+            return cls(
+                total=float(restored["total"]),
+                last_time=dt_util.parse_datetime(last_time) if last_time else None,
+                last_value=restored.get("last_value"),
+            )
+        except (KeyError, TypeError, ValueError):
+            return None
+
+
+@dataclass
+class OSOEnergyFleetAccumulator(ExtraStoredData):
+    """Sum of the integrals of several rates, one per heater.
+
+    Each heater is integrated on its own, so a heater that is offline leaves
+    a gap in the sum just like it does in its own total.
+    """
+
+    total: float = 0.0
+    parts: dict[str, OSOEnergyAccumulator] = field(default_factory=dict)
+
+    def add_samples(self, time: datetime, values: Mapping[str, float | None]) -> None:
+        """Add a sample for each heater."""
+        for key, value in values.items():
+            if (part := self.parts.get(key)) is None:
+                part = self.parts[key] = OSOEnergyAccumulator()
+            self.total += part.add_sample(time, value)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a dict representation of the accumulator."""
+        return {
+            "total": self.total,
+            "parts": {key: part.as_dict() for key, part in self.parts.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, restored: dict[str, Any]) -> OSOEnergyFleetAccumulator | None:
+        """Initialize an accumulator from a dict."""
+        try:
+            parts = {
+                key: OSOEnergyAccumulator.from_dict(part)
+                for key, part in restored.get("parts", {}).items()
+            }
+            return cls(
+                total=float(restored["total"]),
+                parts={key: part for key, part in parts.items() if part is not None},
+            )
+        except (AttributeError, KeyError, TypeError, ValueError):
+            return None
+
+
+def get_price(hass: HomeAssistant, entity_id: str) -> tuple[float, str] | None:
+    """Return the current price per kWh and the currency of a price entity.
+
+    Raise ValueError if the price is not in a currency per Wh, kWh or MWh,
+    such as NOK/kWh.
+    """
+    if (state := hass.states.get(entity_id)) is None:
+        return None
+
+    unit = state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+    currency, _, energy_unit = str(unit).partition("/")
+    currency = currency.strip().upper()
+    factor = PRICE_FACTORS.get(energy_unit.strip())
+    if currency not in ACTIVE_CURRENCIES or factor is None:
+        raise ValueError(f"{entity_id} has unsupported price unit {unit}")
+
+    try:
+        return float(state.state) * factor, currency
+    except ValueError:
+        return None
@@ -0,0 +1,85 @@
+"""Account wide aggregates of OSO Energy water heaters."""
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime
+
+from apyosoenergyapi import OSOEnergy
+
+from .snapshot import OSOEnergyHeaterSnapshot, async_get_heater_snapshots
+
+
+@dataclass(frozen=True, slots=True)
+class OSOEnergyFleetSummary:
+    """Aggregated state of all online water heaters of an account."""
+
+    total_power_load: float
+    total_capacity_mixed_water_40: float
+    heating_count: int
+    holiday_mode_count: int
+    min_temperature: float | None
+    average_temperature: float | None
+
+
+def summarize_heaters(
+    snapshots: Iterable[OSOEnergyHeaterSnapshot],
+) -> OSOEnergyFleetSummary:
+    """Aggregate the heaters of an account in a single pass."""
+    total_power_load = 0.0
+    total_capacity = 0.0
+    heating_count = 0
+    holiday_mode_count = 0
+    min_temperature: float | None = None
+    temperature_sum = 0.0
+    temperature_count = 0
+
+    for heater in snapshots:
+        if not heater.online:
+            continue
+
+        total_power_load += heater.power_load
+        total_capacity += heater.capacity_mixed_water_40
+        heating_count += heater.heater_state
+        holiday_mode_count += heater.holiday_mode
+        if (temperature := heater.current_temperature) is not None:
+            temperature_sum += temperature
+            temperature_count += 1
+            if min_temperature is None or temperature < min_temperature:
+                min_temperature = temperature
+
+    return OSOEnergyFleetSummary(
+        total_power_load=round(total_power_load, 3),
+        total_capacity_mixed_water_40=round(total_capacity, 1),
+        heating_count=heating_count,
+        holiday_mode_count=holiday_mode_count,
+        min_temperature=min_temperature,
+        average_temperature=(
+            round(temperature_sum / temperature_count, 1)
+            if temperature_count
+            else None
+        ),
+    )
+
+
+class OSOEnergyFleet:
+    """Share the aggregates of an account between its entities."""
+
+    def __init__(self, osoenergy: OSOEnergy) -> None:
+        """Initialize the fleet."""
+        self.osoenergy = osoenergy
+        self.summary: OSOEnergyFleetSummary | None = None
+        self.heaters: dict[str, OSOEnergyHeaterSnapshot] = {}
+        self._last_update: datetime | None = None
+
+    async def async_update(self) -> OSOEnergyFleetSummary:
+        """Return the aggregates, computing them once per poll."""
+        await self.osoenergy.session.update_data()
+        last_update = self.osoenergy.session.config.last_update
+        if self.summary is None or last_update != self._last_update:
+            snapshots = await async_get_heater_snapshots(self.osoenergy)
+            self.summary = summarize_heaters(snapshots)
+            self.heaters = {heater.device.device_id: heater for heater in snapshots}
+            self._last_update = last_update
+
+        return self.summary
@@ -0,0 +1,197 @@
+"""Site wide load shedding across OSO Energy water heaters."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+import logging
+from typing import Any
+
+from aiohttp import ClientError
+from aiohttp.web_exceptions import HTTPError
+from apyosoenergyapi import OSOEnergy
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+import homeassistant.util.dt as dt_util
+
+from .const import CONF_POWER_LIMIT
+from .snapshot import OSOEnergyHeaterSnapshot, async_get_heater_snapshots
+from .trace import fork_api
+
+_LOGGER = logging.getLogger(__name__)
+
+CYCLE_INTERVAL = timedelta(seconds=30)
+# Turning a heater off without a temperature limit lasts for one hour.
+SHED_DURATION = timedelta(hours=1)
+MAX_CONCURRENT_COMMANDS = 10
+
+
+@dataclass(slots=True)
+class ShedHeater:
+    """A heater turned off by the load shedder."""
+
+    power_load: float
+    until: datetime
+
+
+@dataclass(slots=True)
+class LoadSheddingPlan:
+    """Commands for a single load shedding cycle."""
+
+    power_load: float = 0.0
+    shed: list[OSOEnergyHeaterSnapshot] = field(default_factory=list)
+    release: list[OSOEnergyHeaterSnapshot] = field(default_factory=list)
+
+
+def plan_load_shedding(
+    snapshots: Iterable[OSOEnergyHeaterSnapshot],
+    shed: dict[str, ShedHeater],
+    power_limit: float,
+) -> LoadSheddingPlan:
+    """Decide which heaters to turn off and which to release.
+
+    Heaters at or below their V40 min are never shed. Otherwise heaters with
+    the most mixed water above their V40 min are shed first. Releasing a shed
+    heater forces it to heat for an hour, so this is only done once it drops
+    to its V40 min, and it is expected to draw the load it had when it was
+    shed. Other shed heaters return to their own schedule when their turn off
+    runs out.
+    """
+    plan = LoadSheddingPlan()
+    candidates: list[tuple[float, OSOEnergyHeaterSnapshot]] = []
+    power_load = 0.0
+
+    for heater in snapshots:
+        if not heater.online:
+            continue
+
+        power_load += heater.power_load
+        surplus = heater.capacity_mixed_water_40 - heater.v40_min
+        if (shed_heater := shed.get(heater.device.device_id)) is not None:
+            if surplus <= 0:
+                plan.release.append(heater)
+                power_load += shed_heater.power_load
+        elif heater.heater_state and heater.power_load > 0 and surplus > 0:
+            candidates.append((surplus, heater))
+
+    if power_load > power_limit:
+        candidates.sort(key=lambda candidate: candidate[0], reverse=True)
+        for _, heater in candidates:
+            if power_load <= power_limit:
+                break
+            plan.shed.append(heater)
+            power_load -= heater.power_load
+
+    plan.power_load = power_load
+    return plan
+
+
+class OSOEnergyLoadShedder:
+    """Keep the total load of all heaters of an account below a limit."""
+
+    def __init__(self, osoenergy: OSOEnergy, power_limit: float) -> None:
+        """Initialize the load shedder."""
+        self.osoenergy = osoenergy
+        self.power_limit = power_limit
+        self.shed: dict[str, ShedHeater] = {}
+        self._cycle_lock = asyncio.Lock()
+        self._command_semaphore = asyncio.Semaphore(MAX_CONCURRENT_COMMANDS)
+
+    async def async_run_cycle(self, *_: Any) -> None:
+        """Poll the heaters and shed or release them as needed."""
+        if self._cycle_lock.locked():
+            return
+
+        async with self._cycle_lock:
+            await self.osoenergy.session.update_data()
+            snapshots = await async_get_heater_snapshots(self.osoenergy)
+            now = dt_util.utcnow()
+            self._prune(snapshots, now)
+
+            plan = plan_load_shedding(snapshots, self.shed, self.power_limit)
+            if not plan.shed and not plan.release:
+                return
+
+            _LOGGER.info(
+                "Shedding %d and releasing %d heaters, expected load %.2f kW of %.2f kW",
+                len(plan.shed),
+                len(plan.release),
+                plan.power_load,
+                self.power_limit,
+            )
+
+            # The raw API is used so that the device list is refreshed once per
+            # cycle instead of once per command.
+            until = now + SHED_DURATION
+            await asyncio.gather(
+                *(self._async_shed(heater, until) for heater in plan.shed),
+                *(self._async_release(heater) for heater in plan.release),
+            )
+
+            await self.osoenergy.session.get_devices()
+
+    def _prune(self, snapshots: list[OSOEnergyHeaterSnapshot], now: datetime) -> None:
+        """Forget heaters that are no longer held off by the load shedder."""
+        for heater in snapshots:
+            device_id = heater.device.device_id
+            if (shed_heater := self.shed.get(device_id)) is None:
+                continue
+            if shed_heater.until <= now or (
+                heater.heater_state and heater.power_load > 0
+            ):
+                del self.shed[device_id]
+
+    async def _async_shed(
+        self, heater: OSOEnergyHeaterSnapshot, until: datetime
+    ) -> None:
+        """Turn a heater off for one hour."""
+        if await self._async_command("turn_off", heater):
+            self.shed[heater.device.device_id] = ShedHeater(heater.power_load, until)
+
+    async def _async_release(self, heater: OSOEnergyHeaterSnapshot) -> None:
+        """Turn a shed heater on for one hour."""
+        if await self._async_command("turn_on", heater):
+            self.shed.pop(heater.device.device_id, None)
+
+    async def _async_command(
+        self, command: str, heater: OSOEnergyHeaterSnapshot
+    ) -> bool:
+        """Send a one hour turn on or turn off command to a heater."""
+        async with self._command_semaphore:
+            # Every command gets a client of its own, as a client shares the
+            # response dict between its requests.
+            api = fork_api(self.osoenergy.session.api)
+            try:
+                response = await getattr(api, command)(heater.device.device_id, False)
+                status = response["original"]
+            except (ClientError, HTTPError, ValueError) as err:
+                _LOGGER.warning(
+                    "Load shedding command for %s failed: %s",
+                    heater.device.device_name,
+                    err,
+                )
+                return False
+
+        if status != 200:
+            _LOGGER.warning(
+                "Load shedding command for %s failed with status %s",
+                heater.device.device_name,
+                status,
+            )
+            return False
+
+        return True
+
+
+@callback
+def async_setup_load_shedding(
+    hass: HomeAssistant, entry: ConfigEntry, osoenergy: OSOEnergy
+) -> None:
+    """Start load shedding for the heaters of a config entry."""
+    shedder = OSOEnergyLoadShedder(osoenergy, entry.options[CONF_POWER_LIMIT])
+    entry.async_on_unload(
+        async_track_time_interval(hass, shedder.async_run_cycle, CYCLE_INTERVAL)
+    )
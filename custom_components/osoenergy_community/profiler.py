@@ -0,0 +1,213 @@
+"""Event loop profiling for OSO Energy entity callbacks."""
+from __future__ import annotations
+
+from collections.abc import Callable, Coroutine, Generator
+from dataclasses import dataclass
+from datetime import timedelta
+from functools import wraps
+import logging
+import time
+import types
+from typing import Any, TypeVar
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import (
+    CONF_SLOW_CALLBACK_THRESHOLD,
+    DEFAULT_SLOW_CALLBACK_THRESHOLD,
+    DOMAIN,
+)
+
+_LOGGER = logging.getLogger(__name__)
+_R = TypeVar("_R")
+
+DATA_PROFILER = f"{DOMAIN}_profiler"
+SUMMARY_INTERVAL = timedelta(minutes=5)
+SUMMARY_TOP = 10
+
+
+@dataclass
+class CallbackStats:
+    """Timings collected for a single profiled callback."""
+
+    calls: int = 0
+    slow_calls: int = 0
+    wall_time: float = 0.0
+    busy_time: float = 0.0
+    cpu_time: float = 0.0
+    slowest_step: float = 0.0
+
+
+class OSOEnergyProfiler:
+    """Collect wall, loop and CPU time spent in OSO Energy callbacks."""
+
+    def __init__(self, slow_threshold: float) -> None:
+        """Initialize the profiler.
+
+        The slow threshold is expressed in seconds.
+        """
+        self.slow_threshold = slow_threshold
+        self.stats: dict[str, CallbackStats] = {}
+
+    @callback
+    def async_record(
+        self,
+        name: str,
+        wall_time: float,
+        busy_time: float,
+        cpu_time: float,
+        slowest_step: float,
+    ) -> None:
+        """Record a single callback invocation."""
+        if (stats := self.stats.get(name)) is None:
+            stats = self.stats[name] = CallbackStats()
+
+        stats.calls += 1
+        stats.wall_time += wall_time
+        stats.busy_time += busy_time
+        stats.cpu_time += cpu_time
+        stats.slowest_step = max(stats.slowest_step, slowest_step)
+
+        if slowest_step >= self.slow_threshold:
+            stats.slow_calls += 1
+            _LOGGER.warning(
+                "Slow callback %s blocked the event loop for %.1f ms",
+                name,
+                slowest_step * 1000,
+            )
+
+    @callback
+    def async_log_summary(self, *_: Any) -> None:
+        """Log the busiest callbacks since the previous summary and reset."""
+        if not self.stats:
+            return
+
+        busiest = sorted(
+            self.stats.items(), key=lambda item: item[1].busy_time, reverse=True
+        )
+        lines = [
+            f"{name}: calls={stats.calls} slow={stats.slow_calls} "
+            f"loop={stats.busy_time * 1000:.1f}ms cpu={stats.cpu_time * 1000:.1f}ms "
+            f"wall={stats.wall_time * 1000:.1f}ms "
+            f"max_step={stats.slowest_step * 1000:.1f}ms"
+            for name, stats in busiest[:SUMMARY_TOP]
+        ]
+        _LOGGER.info("OSO Energy event loop usage:\n%s", "\n".join(lines))
+        self.stats.clear()
+
+    def run_callback(self, name: str, func: Callable[[], _R]) -> _R:
+        """Run a synchronous callback and record its timings."""
+        start = time.perf_counter()
+        start_cpu = time.thread_time()
+        try:
+            return func()
+        finally:
+            elapsed = time.perf_counter() - start
+            self.async_record(
+                name, elapsed, elapsed, time.thread_time() - start_cpu, elapsed
+            )
+
+    @types.coroutine
+    def run_coroutine(
+        self, name: str, coro: Coroutine[Any, Any, _R]
+    ) -> Generator[Any, Any, _R]:
+        """Drive a coroutine and record its timings.
+
+        Every step between two suspension points runs on the event loop, so
+        timing the steps individually separates time spent blocking the loop
+        from time spent waiting for the OSO Energy API.
+        """
+        busy_time = cpu_time = slowest_step = 0.0
+        started = time.perf_counter()
+        send: Callable[[Any], Any] = coro.send
+        value: Any = None
+        try:
+            while True:
+                step_start = time.perf_counter()
+                step_cpu = time.thread_time()
+                try:
+                    future = send(value)
+                except StopIteration as stop:
+                    return stop.value
+                finally:
+                    step = time.perf_counter() - step_start
+                    busy_time += step
+                    cpu_time += time.thread_time() - step_cpu
+                    slowest_step = max(slowest_step, step)
+
+                try:
+                    value = yield future
+                except GeneratorExit:
+                    coro.close()
+                    raise
+                except BaseException as err:  # pylint: disable=broad-except
+                    send, value = coro.throw, err
+                else:
+                    send = coro.send
+        finally:
+            self.async_record(
+                name,
+                time.perf_counter() - started,
+                busy_time,
+                cpu_time,
+                slowest_step,
+            )
+
+
+@callback
+def async_setup_profiler(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Enable profiling for the entities of a config entry."""
+    threshold = entry.options.get(
+        CONF_SLOW_CALLBACK_THRESHOLD, DEFAULT_SLOW_CALLBACK_THRESHOLD
+    )
+    profiler = OSOEnergyProfiler(threshold / 1000)
+    profilers = hass.data.setdefault(DATA_PROFILER, {})
+    profilers[entry.entry_id] = profiler
+
+    @callback
+    def _async_remove_profiler() -> None:
+        profiler.async_log_summary()
+        profilers.pop(entry.entry_id, None)
+
+    entry.async_on_unload(
+        async_track_time_interval(hass, profiler.async_log_summary, SUMMARY_INTERVAL)
+    )
+    entry.async_on_unload(_async_remove_profiler)
+
+
+@callback
+def async_get_profiler(hass: HomeAssistant, entry_id: str) -> OSOEnergyProfiler | None:
+    """Return the profiler of a config entry if profiling is enabled."""
+    return hass.data.get(DATA_PROFILER, {}).get(entry_id)
+
+
+def profile_callback(func: Callable[[Any], _R]) -> Callable[[Any], _R]:
+    """Profile an entity property getter or other synchronous callback."""
+
+    @wraps(func)
+    def wrapper(self: Any) -> _R:
+        if (profiler := self.profiler) is None:
+            return func(self)
+        return profiler.run_callback(
+            f"{type(self).__name__}.{func.__name__}", lambda: func(self)
+        )
+
+    return wrapper
+
+
+def profile_coroutine(
+    func: Callable[..., Coroutine[Any, Any, _R]]
+) -> Callable[..., Coroutine[Any, Any, _R]]:
+    """Profile an entity update or service handler coroutine."""
+
+    @wraps(func)
+    async def wrapper(self: Any, *args: Any, **kwargs: Any) -> _R:
+        if (profiler := self.profiler) is None:
+            return await func(self, *args, **kwargs)
+        return await profiler.run_coroutine(
+            f"{type(self).__name__}.{func.__name__}", func(self, *args, **kwargs)
+        )
+
+    return wrapper
@@ -2,26 +2,39 @@
 
 from collections.abc import Callable
 from dataclasses import dataclass
+import logging
 from typing import Any
 
 from apyosoenergyapi import OSOEnergy
-from apyosoenergyapi.helper.const import OSOEnergySensorData
+from apyosoenergyapi.helper.const import OSOEnergySensorData, OSOEnergyWaterHeaterData
 
 from homeassistant.components.sensor import (
+    RestoreSensor,
     SensorDeviceClass,
     SensorEntity,
     SensorEntityDescription,
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import UnitOfEnergy, UnitOfPower, UnitOfVolume
+from homeassistant.const import (
+    ATTR_UNIT_OF_MEASUREMENT,
+    UnitOfEnergy,
+    UnitOfPower,
+    UnitOfTemperature,
+    UnitOfVolume,
+)
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
 import homeassistant.util.dt as dt_util
 
-from . import OSOEnergyEntity
-from .const import DOMAIN
+from . import OSOEnergyAccountEntity, OSOEnergyBaseEntity, OSOEnergyEntity
+from .const import CONF_PRICE_ENTITY, DOMAIN
+from .energy import OSOEnergyAccumulator, OSOEnergyFleetAccumulator, get_price
+from .fleet import OSOEnergyFleet, OSOEnergyFleetSummary
+from .profiler import profile_callback, profile_coroutine
+
+_LOGGER = logging.getLogger(__name__)
 
 ENUM_VALUE_MAPPING: dict[str, dict[str, Any]] = {
     "heater_mode": {"powersave": "power_save", "extraenergy": "extra_energy"},
@@ -136,6 +149,107 @@ SENSOR_TYPES: tuple[OSOEnergySensorEntityDescription, ...] = (
 )
 
 
+@dataclass
+class OSOEnergyFleetSensorEntityDescription(SensorEntityDescription):
+    """Class describing OSO Energy account aggregate sensor entities."""
+
+    value: Callable[[OSOEnergyFleetSummary], StateType] = round
+
+
+FLEET_SENSOR_TYPES: tuple[OSOEnergyFleetSensorEntityDescription, ...] = (
+    OSOEnergyFleetSensorEntityDescription(
+        key="total_power_load",
+        translation_key="total_power_load",
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfPower.KILO_WATT,
+        value=lambda summary: summary.total_power_load,
+    ),
+    OSOEnergyFleetSensorEntityDescription(
+        key="total_capacity_mixed_water_40",
+        translation_key="total_capacity_mixed_water_40",
+        device_class=SensorDeviceClass.VOLUME,
+        native_unit_of_measurement=UnitOfVolume.LITERS,
+        value=lambda summary: summary.total_capacity_mixed_water_40,
+    ),
+    OSOEnergyFleetSensorEntityDescription(
+        key="heating_count",
+        translation_key="heating_count",
+        state_class=SensorStateClass.MEASUREMENT,
+        value=lambda summary: summary.heating_count,
+    ),
+    OSOEnergyFleetSensorEntityDescription(
+        key="holiday_mode_count",
+        translation_key="holiday_mode_count",
+        state_class=SensorStateClass.MEASUREMENT,
+        value=lambda summary: summary.holiday_mode_count,
+    ),
+    OSOEnergyFleetSensorEntityDescription(
+        key="min_temperature",
+        translation_key="min_temperature",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        value=lambda summary: summary.min_temperature,
+    ),
+    OSOEnergyFleetSensorEntityDescription(
+        key="average_temperature",
+        translation_key="average_temperature",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        value=lambda summary: summary.average_temperature,
+    ),
+)
+
+
+@dataclass
+class OSOEnergyMeterSensorEntityDescription(SensorEntityDescription):
+    """Class describing OSO Energy energy and cost sensor entities."""
+
+    value: Callable[[float, float | None], float | None] = round
+    requires_price: bool = False
+
+
+METER_SENSOR_TYPES: tuple[OSOEnergyMeterSensorEntityDescription, ...] = (
+    OSOEnergyMeterSensorEntityDescription(
+        key="energy",
+        translation_key="energy",
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        value=lambda power, price: power,
+    ),
+    OSOEnergyMeterSensorEntityDescription(
+        key="cost",
+        translation_key="cost",
+        device_class=SensorDeviceClass.MONETARY,
+        state_class=SensorStateClass.TOTAL,
+        value=lambda power, price: None if price is None else power * price,
+        requires_price=True,
+    ),
+)
+
+FLEET_METER_SENSOR_TYPES: tuple[OSOEnergyMeterSensorEntityDescription, ...] = (
+    OSOEnergyMeterSensorEntityDescription(
+        key="total_energy",
+        translation_key="total_energy",
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        value=lambda power, price: power,
+    ),
+    OSOEnergyMeterSensorEntityDescription(
+        key="total_cost",
+        translation_key="total_cost",
+        device_class=SensorDeviceClass.MONETARY,
+        state_class=SensorStateClass.TOTAL,
+        value=lambda power, price: None if price is None else power * price,
+        requires_price=True,
+    ),
+)
+
+
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
@@ -149,6 +263,31 @@ async def async_setup_entry(
                 if dev.osoEnergyType.lower() == description.key:
                     entities.append(OSOEnergySensor(osoenergy, description, dev))
 
+    if heaters := osoenergy.session.device_list.get("water_heater"):
+        fleet = OSOEnergyFleet(osoenergy)
+        price_entity = entry.options.get(CONF_PRICE_ENTITY)
+        for fleet_description in FLEET_SENSOR_TYPES:
+            entities.append(
+                OSOEnergyFleetSensor(osoenergy, entry, fleet, fleet_description)
+            )
+        for meter_description in METER_SENSOR_TYPES:
+            if meter_description.requires_price and not price_entity:
+                continue
+            for heater in heaters:
+                entities.append(
+                    OSOEnergyMeterSensor(
+                        osoenergy, heater, fleet, meter_description, price_entity
+                    )
+                )
+        for meter_description in FLEET_METER_SENSOR_TYPES:
+            if meter_description.requires_price and not price_entity:
+                continue
+            entities.append(
+                OSOEnergyFleetMeterSensor(
+                    osoenergy, entry, fleet, meter_description, price_entity
+                )
+            )
+
     async_add_entities(entities, True)
 
 
@@ -172,11 +311,179 @@ class OSOEnergySensor(OSOEnergyEntity[OSOEnergySensorData], SensorEntity):
         self.entity_description = description
 
     @property
+    @profile_callback
     def native_value(self) -> StateType:
         """Return the state of the sensor."""
         return self.entity_description.value(self.device)
 
+    @profile_coroutine
     async def async_update(self):
         """Update all data for OSO Energy."""
-        await self.osoenergy.session.update_data()
-        self.device = await self.osoenergy.sensor.get_sensor(self.device)
+        await self.async_update_device(self.osoenergy.sensor.get_sensor)
+
+
+class OSOEnergyFleetSensor(OSOEnergyAccountEntity, SensorEntity):
+    """OSO Energy Account Aggregate Sensor Entity."""
+
+    entity_description: OSOEnergyFleetSensorEntityDescription
+
+    def __init__(
+        self,
+        instance: OSOEnergy,
+        entry: ConfigEntry,
+        fleet: OSOEnergyFleet,
+        description: OSOEnergyFleetSensorEntityDescription,
+    ) -> None:
+        """Initialize the aggregate sensor."""
+        super().__init__(instance, entry)
+
+        self.fleet = fleet
+        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+        self.entity_description = description
+
+    @property
+    @profile_callback
+    def native_value(self) -> StateType:
+        """Return the state of the sensor."""
+        if self.fleet.summary is None:
+            return None
+        return self.entity_description.value(self.fleet.summary)
+
+    @profile_coroutine
+    async def async_update(self):
+        """Update the aggregates of all heaters of the account."""
+        await self.fleet.async_update()
+
+
+class OSOEnergyMeterEntity(OSOEnergyBaseEntity, RestoreSensor):
+    """Integrate power loads into energy or cost across restarts."""
+
+    entity_description: OSOEnergyMeterSensorEntityDescription
+    accumulator: OSOEnergyAccumulator | OSOEnergyFleetAccumulator
+    price_entity: str | None
+    _price_error_logged = False
+
+    async def async_added_to_hass(self) -> None:
+        """Restore the accumulated total and its currency."""
+        await super().async_added_to_hass()
+        if (restored := await self.async_get_last_extra_data()) is not None:
+            if accumulator := type(self.accumulator).from_dict(restored.as_dict()):
+                self.accumulator = accumulator
+        if self.entity_description.requires_price:
+            last_state = await self.async_get_last_state()
+            self._attr_native_unit_of_measurement = (
+                last_state and last_state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+            ) or self.hass.config.currency
+
+    @property
+    def extra_restore_state_data(
+        self,
+    ) -> OSOEnergyAccumulator | OSOEnergyFleetAccumulator:
+        """Return the accumulator to be restored after a restart."""
+        return self.accumulator
+
+    @property
+    @profile_callback
+    def native_value(self) -> StateType:
+        """Return the state of the sensor."""
+        return round(self.accumulator.total, 3)
+
+    def sample_value(
+        self, power_load: float | None, price: float | None
+    ) -> float | None:
+        """Return the rate to integrate for a power load."""
+        if power_load is None:
+            return None
+        return self.entity_description.value(power_load, price)
+
+    def get_price(self) -> float | None:
+        """Return the price per kWh, following the currency of the price."""
+        if not self.entity_description.requires_price or self.price_entity is None:
+            return None
+
+        try:
+            price = get_price(self.hass, self.price_entity)
+        except ValueError as err:
+            if not self._price_error_logged:
+                _LOGGER.warning("Not counting the energy cost: %s", err)
+                self._price_error_logged = True
+            return None
+
+        if price is None:
+            return None
+        self._price_error_logged = False
+        price_per_kwh, self._attr_native_unit_of_measurement = price
+        return price_per_kwh
+
+
+class OSOEnergyMeterSensor(
+    OSOEnergyEntity[OSOEnergyWaterHeaterData], OSOEnergyMeterEntity
+):
+    """OSO Energy Heater Energy and Cost Sensor Entity."""
+
+    def __init__(
+        self,
+        instance: OSOEnergy,
+        osoenergy_device: OSOEnergyWaterHeaterData,
+        fleet: OSOEnergyFleet,
+        description: OSOEnergyMeterSensorEntityDescription,
+        price_entity: str | None,
+    ) -> None:
+        """Initialize the energy or cost sensor."""
+        super().__init__(instance, osoenergy_device)
+
+        self.fleet = fleet
+        self.accumulator = OSOEnergyAccumulator()
+        self.price_entity = price_entity
+        self._attr_unique_id = f"{osoenergy_device.device_id}_{description.key}"
+        self.entity_description = description
+
+    @profile_coroutine
+    async def async_update(self):
+        """Integrate the power load of the heater."""
+        await self.fleet.async_update()
+        heater = self.fleet.heaters.get(self.device.device_id)
+        if heater is None or not heater.online:
+            self.accumulator.add_sample(self.last_poll, None)
+            return
+
+        self._set_last_good_update()
+        self.accumulator.add_sample(
+            self.last_poll, self.sample_value(heater.power_load, self.get_price())
+        )
+
+
+class OSOEnergyFleetMeterSensor(OSOEnergyAccountEntity, OSOEnergyMeterEntity):
+    """OSO Energy Account Energy and Cost Sensor Entity."""
+
+    def __init__(
+        self,
+        instance: OSOEnergy,
+        entry: ConfigEntry,
+        fleet: OSOEnergyFleet,
+        description: OSOEnergyMeterSensorEntityDescription,
+        price_entity: str | None,
+    ) -> None:
+        """Initialize the energy or cost sensor."""
+        super().__init__(instance, entry)
+
+        self.fleet = fleet
+        self.accumulator = OSOEnergyFleetAccumulator()
+        self.price_entity = price_entity
+        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+        self.entity_description = description
+
+    @profile_coroutine
+    async def async_update(self):
+        """Integrate the power load of each heater of the account."""
+        await self.fleet.async_update()
+        price = self.get_price()
+        self.accumulator.add_samples(
+            self.last_poll,
+            {
+                device_id: self.sample_value(
+                    heater.power_load if heater.online else None, price
+                )
+                for device_id, heater in self.fleet.heaters.items()
+            },
+        )
@@ -0,0 +1,51 @@
+"""Account wide snapshot of OSO Energy water heaters."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from apyosoenergyapi import OSOEnergy
+from apyosoenergyapi.helper.const import OSOEnergyWaterHeaterData
+
+
+@dataclass(frozen=True, slots=True)
+class OSOEnergyHeaterSnapshot:
+    """State of a single water heater at the time of the last poll."""
+
+    device: OSOEnergyWaterHeaterData
+    online: bool
+    power_load: float
+    heater_state: bool
+    capacity_mixed_water_40: float
+    v40_min: float
+    current_temperature: float | None
+    holiday_mode: bool
+
+
+async def async_get_heater_snapshots(
+    osoenergy: OSOEnergy,
+) -> list[OSOEnergyHeaterSnapshot]:
+    """Read the state of every water heater from the session data.
+
+    The attribute getters only read the device data of the last poll and never
+    suspend, so all heaters are read from the same consistent snapshot.
+    """
+    attr = osoenergy.session.attr
+    snapshots = []
+    for device in osoenergy.session.device_list.get("water_heater", []):
+        device_id = device.device_id
+        snapshots.append(
+            OSOEnergyHeaterSnapshot(
+                device=device,
+                online=await attr.online_offline(device_id),
+                power_load=float(await attr.get_actual_load_kwh(device_id) or 0),
+                heater_state=bool(await attr.get_heater_state_bool(device_id)),
+                capacity_mixed_water_40=float(
+                    await attr.get_capacity_mixed_water_40(device_id) or 0
+                ),
+                v40_min=float(await attr.get_v40_min(device_id) or 0),
+                current_temperature=await attr.get_current_temperature(device_id),
+                holiday_mode=await attr.get_power_save_bool(device_id),
+            )
+        )
+
+    return snapshots
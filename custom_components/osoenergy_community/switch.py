@@ -15,6 +15,7 @@ from homeassistant.helpers.typing import StateType
 
 from . import OSOEnergyEntity
 from .const import DOMAIN
+from .profiler import profile_callback, profile_coroutine
 
 
 @dataclass
@@ -75,19 +76,22 @@ class OSOEnergySwitch(OSOEnergyEntity[OSOEnergySwitchData], SwitchEntity):
         self.entity_description = description
 
     @property
+    @profile_callback
     def is_on(self) -> bool:
         """Return true if the switch is on."""
         return self.entity_description.value(self.device)
 
+    @profile_coroutine
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the switch on."""
         await self.entity_description.turn_on(self.osoenergy, self.device)
 
+    @profile_coroutine
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the switch off."""
         await self.entity_description.turn_off(self.osoenergy, self.device)
 
+    @profile_coroutine
     async def async_update(self):
         """Update all data for OSO Energy."""
-        await self.osoenergy.session.update_data()
-        self.device = await self.osoenergy.switch.get_switch(self.device)
+        await self.async_update_device(self.osoenergy.switch.get_switch)
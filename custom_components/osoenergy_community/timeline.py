@@ -0,0 +1,247 @@
+"""Timeline of holiday periods and profile changes of OSO Energy heaters."""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Sequence
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.components.calendar import CalendarEvent
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+import homeassistant.util.dt as dt_util
+
+from .const import DOMAIN
+
+DATA_TIMELINES = f"{DOMAIN}_timelines"
+STORAGE_KEY = f"{DOMAIN}_timelines"
+STORAGE_VERSION = 1
+SAVE_DELAY = 10
+# Holiday mode without a known end lasts for the default period of the API.
+DEFAULT_HOLIDAY_DURATION = timedelta(days=365)
+HOLIDAY_SUMMARY = "Holiday mode"
+ONE_DAY = timedelta(days=1)
+
+
+def _utc_day(time: datetime) -> datetime:
+    """Return the start of the UTC day of a time."""
+    return dt_util.as_utc(time).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _profile_runs(profile: Sequence[float]) -> list[tuple[int, int, float]]:
+    """Split a 24 hour UTC profile into runs of equal temperature."""
+    runs: list[tuple[int, int, float]] = []
+    start = 0
+    for hour in range(1, 25):
+        if hour == 24 or profile[hour] != profile[start]:
+            runs.append((start, hour, profile[start]))
+            start = hour
+    return runs
+
+
+class OSOEnergyTimeline:
+    """Calendar events of a single water heater.
+
+    The profile repeats every UTC day, so only its runs of equal temperature
+    are kept, and profile events are generated for the queried range alone.
+    """
+
+    def __init__(self, on_change: Callable[[], None] | None = None) -> None:
+        """Initialize the timeline."""
+        self._on_change = on_change
+        self._profile: list[float] | None = None
+        self._runs: list[tuple[int, int, float]] = []
+        self._holidays: list[CalendarEvent] = []
+        self._holiday_open = False
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the holiday periods as a dict to be stored."""
+        return {
+            "holidays": [
+                {
+                    "start": holiday.start.isoformat(),
+                    "end": holiday.end.isoformat(),
+                    "description": holiday.description,
+                }
+                for holiday in self._holidays
+            ],
+            "holiday_open": self._holiday_open,
+        }
+
+    @callback
+    def async_restore(self, stored: dict[str, Any]) -> None:
+        """Restore the stored holiday periods."""
+        holidays = []
+        for holiday in stored.get("holidays", []):
+            start = dt_util.parse_datetime(holiday["start"])
+            end = dt_util.parse_datetime(holiday["end"])
+            if start is None or end is None:
+                continue
+            holidays.append(
+                CalendarEvent(
+                    start=start,
+                    end=end,
+                    summary=HOLIDAY_SUMMARY,
+                    description=holiday.get("description"),
+                )
+            )
+        self._holidays = holidays
+        self._holiday_open = bool(holidays) and stored.get("holiday_open", False)
+
+    @callback
+    def async_update_profile(self, profile: Sequence[float] | None) -> None:
+        """Split the profile into runs when it has changed."""
+        if profile is None or len(profile) != 24 or list(profile) == self._profile:
+            return
+
+        self._profile = list(profile)
+        self._runs = _profile_runs(self._profile)
+
+    @callback
+    def async_start_holiday(
+        self, start: datetime, end: datetime | None = None
+    ) -> None:
+        """Record a holiday period starting now."""
+        self._async_close_holiday(start)
+        self._holidays.append(
+            CalendarEvent(
+                start=start,
+                end=end or start + DEFAULT_HOLIDAY_DURATION,
+                summary=HOLIDAY_SUMMARY,
+                description=None if end else "End date unknown",
+            )
+        )
+        self._holiday_open = True
+        self._async_changed()
+
+    @callback
+    def async_end_holiday(self, end: datetime) -> None:
+        """Record that holiday mode has been disabled."""
+        self._async_close_holiday(end)
+
+    @callback
+    def async_update_holiday_mode(self, is_on: bool, now: datetime) -> None:
+        """Follow holiday mode changes made outside Home Assistant."""
+        if is_on and not self._holiday_open:
+            self.async_start_holiday(now)
+        elif not is_on and self._holiday_open:
+            self.async_end_holiday(now)
+
+    @callback
+    def _async_close_holiday(self, end: datetime) -> None:
+        """End the current holiday period early."""
+        if not self._holiday_open:
+            return
+
+        self._holiday_open = False
+        holiday = self._holidays[-1]
+        if end < holiday.end:
+            self._holidays[-1] = CalendarEvent(
+                start=holiday.start,
+                end=max(end, holiday.start),
+                summary=holiday.summary,
+            )
+        self._async_changed()
+
+    @callback
+    def _async_changed(self) -> None:
+        """Report a change of the holiday periods."""
+        if self._on_change is not None:
+            self._on_change()
+
+    @callback
+    def async_get_events(
+        self, start_date: datetime, end_date: datetime
+    ) -> list[CalendarEvent]:
+        """Return the events overlapping a range."""
+        events = [
+            holiday
+            for holiday in self._holidays
+            if holiday.start < end_date and holiday.end > start_date
+        ]
+        events.extend(
+            event
+            for event in self._generate(_utc_day(start_date), _utc_day(end_date))
+            if event.start < end_date and event.end > start_date
+        )
+        return events
+
+    @callback
+    def async_get_next_event(self, now: datetime) -> CalendarEvent | None:
+        """Return the current or next event."""
+        events = self.async_get_events(now, now + ONE_DAY)
+        return min(events, key=lambda event: event.start, default=None)
+
+    def _generate(self, first_day: datetime, last_day: datetime) -> list[CalendarEvent]:
+        """Generate the profile events from first_day to last_day."""
+        events = []
+        day = first_day
+        while day <= last_day:
+            for start_hour, end_hour, temperature in self._runs:
+                events.append(
+                    CalendarEvent(
+                        start=day + timedelta(hours=start_hour),
+                        end=day + timedelta(hours=end_hour),
+                        summary=f"{temperature:g}°C",
+                    )
+                )
+            day += ONE_DAY
+        return events
+
+
+class OSOEnergyTimelines:
+    """Timelines of all water heaters, with holiday periods saved to storage."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the timelines."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY
+        )
+        self._stored: dict[str, Any] = {}
+        self.timelines: dict[str, OSOEnergyTimeline] = {}
+
+    async def async_load(self) -> None:
+        """Load the stored holiday periods."""
+        self._stored = await self._store.async_load() or {}
+
+    @callback
+    def async_get(self, device_id: str) -> OSOEnergyTimeline:
+        """Return the timeline of a water heater."""
+        if (timeline := self.timelines.get(device_id)) is None:
+            timeline = self.timelines[device_id] = OSOEnergyTimeline(
+                lambda: self._async_save(device_id)
+            )
+            if (stored := self._stored.get(device_id)) is not None:
+                timeline.async_restore(stored)
+        return timeline
+
+    @callback
+    def _async_save(self, device_id: str) -> None:
+        """Save the holiday periods of a water heater."""
+        self._stored[device_id] = self.timelines[device_id].as_dict()
+        self._store.async_delay_save(lambda: self._stored, SAVE_DELAY)
+
+
+async def async_setup_timelines(hass: HomeAssistant) -> None:
+    """Load the timelines once, before the first poll."""
+    if DATA_TIMELINES not in hass.data:
+        timelines = OSOEnergyTimelines(hass)
+        await timelines.async_load()
+        hass.data[DATA_TIMELINES] = timelines
+
+
+@callback
+def async_get_timeline(hass: HomeAssistant, device_id: str) -> OSOEnergyTimeline:
+    """Return the timeline of a water heater."""
+    timelines: OSOEnergyTimelines = hass.data[DATA_TIMELINES]
+    return timelines.async_get(device_id)
+
+
+@callback
+def async_remove_timelines(hass: HomeAssistant, device_ids: Iterable[str]) -> None:
+    """Forget the timelines of unloaded water heaters.
+
+    Their holiday periods stay in storage and are restored on the next load.
+    """
+    timelines: OSOEnergyTimelines = hass.data[DATA_TIMELINES]
+    for device_id in device_ids:
+        timelines.timelines.pop(device_id, None)
@@ -0,0 +1,339 @@
+"""Record and replay OSO Energy API traffic."""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Callable
+import copy
+from datetime import timedelta
+import gzip
+import json
+import logging
+import os
+import time
+from typing import Any
+
+from aiohttp import ClientError
+from aiohttp.web_exceptions import HTTPError
+from apyosoenergyapi import API, OSOEnergy
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import (
+    CONF_REPLAY_SPEED,
+    CONF_TRACE_FILE,
+    CONF_TRACE_MODE,
+    DEFAULT_REPLAY_SPEED,
+    DEFAULT_TRACE_FILE,
+    TRACE_MODE_RECORD,
+    TRACE_MODE_REPLAY,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+TRACE_VERSION = 1
+TRACE_HEADER = json.dumps({"version": TRACE_VERSION}) + "\n"
+TRACED_METHODS = (
+    "get_user_details",
+    "get_devices",
+    "turn_on",
+    "turn_off",
+    "set_profile",
+    "set_optimization_mode",
+    "set_v40_min",
+    "enable_holiday_mode",
+    "disable_holiday_mode",
+)
+FLUSH_INTERVAL = timedelta(seconds=30)
+FLUSH_SIZE = 100
+# Recording stops once the compressed trace reaches this size.
+MAX_TRACE_SIZE = 100 * 1024 * 1024
+# Returned for replayed commands that are not in the trace.
+DEFAULT_RESPONSE = {"original": 200, "parsed": None}
+# Recorded exceptions are raised again as these types, or as HTTPError.
+REPLAYED_ERRORS: dict[str, type[Exception]] = {
+    "ClientError": ClientError,
+    "HTTPError": HTTPError,
+    "OSError": OSError,
+    "TimeoutError": TimeoutError,
+}
+
+
+def _write_records(path: str, lines: list[str]) -> int:
+    """Append records to a trace as a new gzip member, returning its size."""
+    with gzip.open(path, "at", encoding="utf-8") as trace:
+        trace.writelines(lines)
+    return os.path.getsize(path)
+
+
+def _trace_size(path: str) -> int:
+    """Return the size of a trace, or 0 if it does not exist yet."""
+    try:
+        return os.path.getsize(path)
+    except FileNotFoundError:
+        return 0
+
+
+def _read_records(path: str) -> list[dict[str, Any]]:
+    """Read all records of a trace.
+
+    Every recording starts with a header and its own time base, so the times
+    of each recording are shifted to continue after the previous one.
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as trace:
+        lines = [json.loads(line) for line in trace if line.strip()]
+
+    if not lines or lines[0].get("version") != TRACE_VERSION:
+        raise ValueError(f"{path} is not an OSO Energy trace")
+
+    records = []
+    offset = last_time = 0.0
+    for line in lines[1:]:
+        if "version" in line:
+            offset = last_time
+            continue
+        line["t"] += offset
+        last_time = line["t"]
+        records.append(line)
+    return records
+
+
+class OSOEnergyTraceRecorder:
+    """Wrap the OSO Energy API and stream every call to a trace."""
+
+    def __init__(self, hass: HomeAssistant, api: Any, path: str) -> None:
+        """Initialize the recorder."""
+        self.hass = hass
+        self.api = api
+        self.path = path
+        self._started = time.monotonic()
+        self._lines = [TRACE_HEADER]
+        self._flush_task: asyncio.Task | None = None
+        self._stopped = False
+
+        for method in TRACED_METHODS:
+            setattr(self, method, self.wrap(method, getattr(api, method)))
+
+    def __getattr__(self, name: str) -> Any:
+        """Pass everything that is not traced through to the API."""
+        return getattr(self.api, name)
+
+    def fork(self) -> OSOEnergyTracedApi:
+        """Return a traced API client with its own response dict."""
+        return OSOEnergyTracedApi(self, fork_api(self.api))
+
+    def wrap(self, method: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        """Record the calls of an API method."""
+
+        async def traced(*args: Any, **kwargs: Any) -> Any:
+            started = time.monotonic()
+            try:
+                response = await func(*args, **kwargs)
+            except Exception as err:
+                self._record(started, method, args, kwargs, {"e": type(err).__name__})
+                raise
+
+            self._record(started, method, args, kwargs, {"r": response})
+            return response
+
+        return traced
+
+    def _record(
+        self,
+        started: float,
+        method: str,
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+        result: dict[str, Any],
+    ) -> None:
+        """Buffer the record of a call that returned or raised."""
+        if self._stopped:
+            return
+
+        self._lines.append(
+            json.dumps(
+                {
+                    "t": round(started - self._started, 3),
+                    "d": round(time.monotonic() - started, 3),
+                    "m": method,
+                    "a": args,
+                    "k": kwargs,
+                    **result,
+                },
+                default=str,
+            )
+            + "\n"
+        )
+        if len(self._lines) >= FLUSH_SIZE:
+            self.async_flush()
+
+    @callback
+    def async_flush(self, *_: Any) -> None:
+        """Write the buffered records in the background."""
+        if not self._lines or self._stopped:
+            return
+
+        lines, self._lines = self._lines, []
+        self._flush_task = self.hass.async_create_task(
+            self._async_write(self._flush_task, lines)
+        )
+
+    async def _async_write(
+        self, previous: asyncio.Task | None, lines: list[str]
+    ) -> None:
+        """Write records after the previous write has finished."""
+        if previous is not None:
+            await previous
+        if self._stopped:
+            return
+
+        try:
+            if lines[0] is TRACE_HEADER:
+                self._async_check_size(
+                    await self.hass.async_add_executor_job(_trace_size, self.path)
+                )
+                if self._stopped:
+                    return
+            size = await self.hass.async_add_executor_job(
+                _write_records, self.path, lines
+            )
+        except OSError as err:
+            _LOGGER.error("Cannot write API trace to %s: %s", self.path, err)
+            if lines[0] is TRACE_HEADER:
+                # Start the recording over with the next flush.
+                self._lines.insert(0, TRACE_HEADER)
+            return
+
+        self._async_check_size(size)
+
+    @callback
+    def _async_check_size(self, size: int) -> None:
+        """Stop recording once the trace has reached its maximum size."""
+        if size >= MAX_TRACE_SIZE:
+            self._stopped = True
+            self._lines = []
+            _LOGGER.warning(
+                "Stopped recording the API trace, %s has reached %d MB",
+                self.path,
+                MAX_TRACE_SIZE // (1024 * 1024),
+            )
+
+
+class OSOEnergyTracedApi:
+    """Record the calls of a separate API client to the same trace."""
+
+    def __init__(self, recorder: OSOEnergyTraceRecorder, api: Any) -> None:
+        """Initialize the traced client."""
+        self.api = api
+        for method in TRACED_METHODS:
+            setattr(self, method, recorder.wrap(method, getattr(api, method)))
+
+    def __getattr__(self, name: str) -> Any:
+        """Pass everything that is not traced through to the API."""
+        return getattr(self.api, name)
+
+
+class OSOEnergyReplayApi:
+    """Serve the responses of a recorded trace instead of the OSO Energy API.
+
+    Polls return the last device list recorded before the current trace time,
+    which runs faster than real time by the replay speed. Commands return
+    their recorded responses in order. Recorded latencies are replayed at the
+    same speed, and recorded exceptions are raised again.
+    """
+
+    def __init__(self, records: list[dict[str, Any]], speed: float) -> None:
+        """Initialize the replay."""
+        self.speed = speed
+        self._started = time.monotonic()
+        self._polls = [record for record in records if record["m"] == "get_devices"]
+        self._poll_index = 0
+        self._responses: dict[str, deque[dict[str, Any]]] = {}
+        for record in records:
+            if record["m"] != "get_devices":
+                self._responses.setdefault(record["m"], deque()).append(record)
+
+        for method in TRACED_METHODS:
+            if method != "get_devices":
+                setattr(self, method, self._replay(method))
+
+    def fork(self) -> OSOEnergyReplayApi:
+        """Return the replay itself, as its responses are never shared."""
+        return self
+
+    async def get_devices(self) -> dict[str, Any]:
+        """Return the device list recorded at the current trace time."""
+        if not self._polls:
+            return copy.deepcopy(DEFAULT_RESPONSE)
+
+        trace_time = (time.monotonic() - self._started) * self.speed
+        index = self._poll_index
+        last = len(self._polls) - 1
+        while index < last and self._polls[index + 1]["t"] <= trace_time:
+            index += 1
+        self._poll_index = index
+
+        return await self._async_respond(self._polls[index])
+
+    def _replay(self, method: str) -> Callable[..., Any]:
+        """Replay the recorded responses of a command."""
+
+        async def replayed(*args: Any, **kwargs: Any) -> dict[str, Any]:
+            if not (responses := self._responses.get(method)):
+                return copy.deepcopy(DEFAULT_RESPONSE)
+            return await self._async_respond(responses.popleft())
+
+        return replayed
+
+    async def _async_respond(self, record: dict[str, Any]) -> dict[str, Any]:
+        """Wait for the recorded latency and return or raise the result."""
+        await asyncio.sleep(record["d"] / self.speed)
+        if "e" in record:
+            raise REPLAYED_ERRORS.get(record["e"], HTTPError)()
+        return copy.deepcopy(record["r"])
+
+
+def fork_api(api: Any) -> Any:
+    """Return an API client with its own response dict.
+
+    The OSO Energy API client keeps the response of every request in one
+    shared dict, so concurrent requests each need a client of their own.
+    """
+    if isinstance(api, (OSOEnergyTraceRecorder, OSOEnergyReplayApi)):
+        return api.fork()
+    return API(osoenergy_session=api.session, websession=api.websession)
+
+
+async def async_setup_trace(
+    hass: HomeAssistant, entry: ConfigEntry, osoenergy: OSOEnergy
+) -> None:
+    """Record or replay the API traffic of a config entry."""
+    mode = entry.options[CONF_TRACE_MODE]
+    path = hass.config.path(entry.options.get(CONF_TRACE_FILE, DEFAULT_TRACE_FILE))
+
+    if mode == TRACE_MODE_RECORD:
+        recorder = OSOEnergyTraceRecorder(hass, osoenergy.session.api, path)
+        osoenergy.session.api = recorder
+        entry.async_on_unload(
+            async_track_time_interval(hass, recorder.async_flush, FLUSH_INTERVAL)
+        )
+        entry.async_on_unload(recorder.async_flush)
+        _LOGGER.info("Recording OSO Energy API traffic to %s", path)
+
+    elif mode == TRACE_MODE_REPLAY:
+        try:
+            records = await hass.async_add_executor_job(_read_records, path)
+        except (OSError, ValueError) as err:
+            raise ConfigEntryNotReady(f"Cannot read trace {path}: {err}") from err
+
+        speed = entry.options.get(CONF_REPLAY_SPEED, DEFAULT_REPLAY_SPEED)
+        osoenergy.session.api = OSOEnergyReplayApi(records, speed)
+        _LOGGER.info(
+            "Replaying %d OSO Energy API calls from %s at %sx speed",
+            len(records),
+            path,
+            speed,
+        )
@@ -1,5 +1,6 @@
 """Support for OSO Energy water heaters."""
 
+from datetime import timedelta
 from typing import Any
 
 from apyosoenergyapi import OSOEnergy
@@ -23,6 +24,8 @@ import homeassistant.util.dt as dt_util
 
 from . import OSOEnergyEntity
 from .const import DOMAIN
+from .profiler import profile_callback, profile_coroutine
+from .timeline import async_get_timeline
 
 ATTR_DURATION_DAYS = "duration_days"
 ATTR_UNTIL_TEMP_LIMIT = "until_temp_limit"
@@ -146,9 +149,10 @@ class OSOEnergyWaterHeater(
     @property
     def available(self) -> bool:
         """Return if the device is available."""
-        return self.device.available
+        return super().available and self.device.available
 
     @property
+    @profile_callback
     def current_operation(self) -> str:
         """Return current operation."""
         status = self.device.current_operation
@@ -199,34 +203,42 @@ class OSOEnergyWaterHeater(
         """Return the maximum temperature."""
         return self.device.max_temperature
 
+    @profile_coroutine
     async def async_turn_away_mode_on(self) -> None:
         """Turn on away mode."""
-        await self.osoenergy.hotwater.enable_holiday_mode(self.device)
+        await self.async_enable_holiday_mode()
 
+    @profile_coroutine
     async def async_turn_away_mode_off(self) -> None:
         """Turn off away mode."""
-        await self.osoenergy.hotwater.disable_holiday_mode(self.device)
+        await self.async_disable_holiday_mode()
 
+    @profile_coroutine
     async def async_turn_on(self, **kwargs) -> None:
         """Turn on hotwater."""
         await self.osoenergy.hotwater.turn_on(self.device, True)
 
+    @profile_coroutine
     async def async_turn_off(self, **kwargs) -> None:
         """Turn off hotwater."""
         await self.osoenergy.hotwater.turn_off(self.device, True)
 
+    @profile_coroutine
     async def async_oso_turn_on(self, until_temp_limit) -> None:
         """Handle the service call."""
         await self.osoenergy.hotwater.turn_on(self.device, until_temp_limit)
 
+    @profile_coroutine
     async def async_oso_turn_off(self, until_temp_limit) -> None:
         """Handle the service call."""
         await self.osoenergy.hotwater.turn_off(self.device, until_temp_limit)
 
+    @profile_coroutine
     async def async_set_v40_min(self, v40_min) -> None:
         """Handle the service call."""
         await self.osoenergy.hotwater.set_v40_min(self.device, v40_min)
 
+    @profile_coroutine
     async def async_set_temperature(self, **kwargs: Any) -> None:
         """Set new target temperature."""
         target_temperature = int(kwargs.get("temperature", self.target_temperature))
@@ -234,6 +246,7 @@ class OSOEnergyWaterHeater(
 
         await self.osoenergy.hotwater.set_profile(self.device, profile)
 
+    @profile_coroutine
     async def async_set_profile(self, **kwargs: Any) -> None:
         """Handle the service call."""
         profile = self.device.profile
@@ -246,18 +259,29 @@ class OSOEnergyWaterHeater(
 
         await self.osoenergy.hotwater.set_profile(self.device, profile)
 
+    @profile_coroutine
     async def async_enable_holiday_mode(self, duration_days: int | None = None) -> None:
         """Enable holiday mode."""
         if duration_days is None:
             duration_days = 365
 
-        await self.osoenergy.hotwater.enable_holiday_mode(self.device, duration_days)
+        if await self.osoenergy.hotwater.enable_holiday_mode(
+            self.device, duration_days
+        ):
+            now = dt_util.utcnow()
+            async_get_timeline(self.hass, self.device.device_id).async_start_holiday(
+                now, now + timedelta(days=duration_days)
+            )
 
+    @profile_coroutine
     async def async_disable_holiday_mode(self) -> None:
         """Disable holiday mode."""
-        await self.osoenergy.hotwater.disable_holiday_mode(self.device)
+        if await self.osoenergy.hotwater.disable_holiday_mode(self.device):
+            async_get_timeline(self.hass, self.device.device_id).async_end_holiday(
+                dt_util.utcnow()
+            )
 
+    @profile_coroutine
     async def async_update(self) -> None:
         """Update all Node data from Hive."""
-        await self.osoenergy.session.update_data()
-        self.device = await self.osoenergy.hotwater.get_water_heater(self.device)
+        await self.async_update_device(self.osoenergy.hotwater.get_water_heater)